@@ -1,6 +1,8 @@
 import os
 from langchain_community.document_loaders import UnstructuredMarkdownLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_core.documents import Document
+from sources import merge_elements
 
 def load_markdown_documents(folder_path):
     docs = []
@@ -8,8 +10,10 @@ def load_markdown_documents(folder_path):
         for file in files:
             if file.lower().endswith(".md"):
                 file_path = os.path.join(root, file)
-                loader = UnstructuredMarkdownLoader(file_path)
-                docs.extend(loader.load())
+                # Load as elements so section headings are known by offset
+                loader = UnstructuredMarkdownLoader(file_path, mode="elements")
+                text, headings = merge_elements(loader.load())
+                docs.append(Document(page_content=text, metadata={'source': file_path, 'headings': headings}))
                 
     return docs
 
@@ -17,6 +21,7 @@ def chunk_documents(documents, chunk_size=1000, chunk_overlap=100):
     splitter = RecursiveCharacterTextSplitter(
         chunk_size=chunk_size,
         chunk_overlap=chunk_overlap,
-        separators=["\n## ", "\n### ", "\n", " ", ""]
+        separators=["\n## ", "\n### ", "\n", " ", ""],
+        add_start_index=True  # lets the indexer map each chunk to its section heading
     )
     return splitter.split_documents(documents)
@@ -3,6 +3,7 @@ from qdrant_client import QdrantClient, models
 from chunker import load_markdown_documents, chunk_documents
 import config
 import qdrant_operations
+import sources
 
 class Indexer:
     def __init__(self):
@@ -10,13 +11,13 @@ class Indexer:
         self.embedding_model = LateInteractionTextEmbedding(model_name=config.EMBEDDING_MODEL, cache_dir=config.EMBEDDING_MODEL_PATH)
         self.batch_size = config.EMBEDDING_BATCH_SIZE
 
-    def __index_chunks(self, chunks, metadata, collection_name):
+    def __index_chunks(self, chunks, metadata, manifest, collection_name):
         for i in range(1000, len(chunks), self.batch_size):
            #print(i)
             batch_chunks_embeddings_list = list(
                 self.embedding_model.embed(chunks[i:i + self.batch_size])
             )
-            chunks_list = [{'text': chunk, 'source': metadata[i+j]['source']} 
+            chunks_list = [sources.chunk_payload(chunk, metadata[i+j], manifest)
                            for j, chunk in enumerate(chunks[i:i + self.batch_size])]
             #print(batch_chunks_embeddings_list, chunks_list)
             qdrant_operations.upload_points_to_collection(
@@ -31,11 +32,18 @@ class Indexer:
         chunks = chunk_documents(documents)
         all_texts = [c.page_content if hasattr(c, "page_content") else str(c) for c in chunks]
         metadata = [c.metadata if hasattr(c, "metadata") else {} for c in chunks]
+        manifest = sources.build_source_manifest(documents, config.SOURCE_FOLDER)
         #print(chunks)
         if not (qdrant_operations.is_collection_available(self.client, config.COLLECTION_NAME)):
             qdrant_operations.setup_collection(self.client, collection_name=config.COLLECTION_NAME)
+        elif not qdrant_operations.has_payload_field(self.client, config.COLLECTION_NAME, 'url'):
+            raise RuntimeError(
+                f"Collection '{config.COLLECTION_NAME}' was indexed with the old payload layout "
+                "(no 'url'/'title'/'section'). Delete it and re-run the indexer."
+            )
+        qdrant_operations.create_source_index(self.client, collection_name=config.COLLECTION_NAME)
 
-        self.__index_chunks(all_texts, metadata, config.COLLECTION_NAME)
+        self.__index_chunks(all_texts, metadata, manifest, config.COLLECTION_NAME)
 
 
 if __name__ == "__main__":
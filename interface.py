@@ -1,7 +1,7 @@
-import os
 from typing import List, Tuple
 import gradio as gr
 from retriever import Retriever
+from sources import render_context_view
 from llm_module import ask_ollama
 import config
 from fastapi.staticfiles import StaticFiles
@@ -10,25 +10,6 @@ from llm_module2 import LLMService
 # Reuse a single LLMService instance so conversation memory persists across turns
 llm_service = LLMService()
 
-def convert_src_to_html_path(src: str) -> str:
-    """Return an HTTP link served from /sources without using a local 'static' folder.
-
-    - Derive HTML name from the markdown source (basename + .html)
-    - Verify it exists in config.SOURCE_FOLDER
-    """
-    if not src:
-        return ""
-    file_name = os.path.basename(src)
-    base, _ext = os.path.splitext(file_name)
-    base = base.split("\\")[-1]
-    html_name = base + ".html"
-    source_html = os.path.join(config.SOURCE_FOLDER, html_name)
-    if not os.path.exists(source_html):
-        return ""
-    return f"{source_html}"
-
-
-
 def respond(message: str, history: List[Tuple[str, str]]) -> Tuple[str, List[Tuple[str, str]], str]:
     try:
         retriever = Retriever()
@@ -47,18 +28,8 @@ def respond(message: str, history: List[Tuple[str, str]]) -> Tuple[str, List[Tup
         print(f"\nRetrieved chunks: {retrieved_chunks}")
         print(f"\nContext MD: {context_md}")
 
-        # Render each dict one below the other in Markdown
-        blocks = []
-        for text, src in zip(retrieved_chunks, retrieved_sources):
-            converted_src = convert_src_to_html_path(src) if src else ""
-            if converted_src:
-                link_html = f'<a href="{converted_src}" target="_blank" rel="noopener noreferrer">{converted_src}</a>'
-                src_display = f"Source: {link_html}"
-            else:
-                src_display = "Source: (unknown)"
-            block = f"**{src_display}**\n\n{text}"
-            blocks.append(block)
-        context_view = "\n\n---\n\n".join(blocks) if blocks else "(no context retrieved)"
+        # url/title/section are resolved at index time, so no disk I/O here
+        context_view = render_context_view(retrieved_chunks, retrieved_sources)
         answer = llm_service.llm_query(message, context_md)
         # answer = ask_ollama(message, context_md, model_name=config.OLLAMA_MODEL)
     except Exception as exc:
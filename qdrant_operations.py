@@ -24,6 +24,36 @@ def setup_collection(qdrant_client, collection_name):
         on_disk_payload=True
     )
 
+def has_payload_field(qdrant_client, collection_name, field_name):
+    """
+    Check whether the points of a collection carry the given payload field.
+    An empty collection is treated as compatible.
+    Args:
+        qdrant_client (QdrantClient): The Qdrant client instance.
+        collection_name : Name of the collection to inspect
+        field_name : Payload field to look for
+    """
+    points, _next = qdrant_client.scroll(
+        collection_name=collection_name,
+        limit=1,
+        with_payload=[field_name],
+        with_vectors=False
+    )
+    return not points or field_name in (points[0].payload or {})
+
+def create_source_index(qdrant_client, collection_name):
+    """
+    Create a keyword payload index on the 'source' field of the collection.
+    Args:
+        qdrant_client (QdrantClient): The Qdrant client instance.
+        collection_name : Name of the collection to index
+    """
+    qdrant_client.create_payload_index(
+        collection_name=collection_name,
+        field_name="source",
+        field_schema=models.PayloadSchemaType.KEYWORD
+    )
+
 def upload_points_to_collection(qdrant_client, collection_name, embeddings, metadata):
     qdrant_client.upload_points(
         collection_name = collection_name,
@@ -39,12 +69,12 @@ def upload_points_to_collection(qdrant_client, collection_name, embeddings, meta
     )
 
 
-def get_querypoints_in_collection(qdrant_client, collection_name, query, k):
+def get_querypoints_in_collection(qdrant_client, collection_name, query, k, payload_fields=None):
     result = qdrant_client.query_points(
             collection_name=collection_name,
             query=query,
             limit=k,
-            with_payload=True
+            with_payload=payload_fields if payload_fields else True
         )
 
     return result
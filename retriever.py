@@ -3,6 +3,9 @@ from qdrant_client import QdrantClient, models
 import config
 import qdrant_operations
 
+# Payload fields needed to render the context pane
+PAYLOAD_FIELDS = ['text', 'url', 'title', 'section']
+
 class Retriever:
     def __init__(self):
         self.client = QdrantClient(host=config.QDRANT_HOST, port=config.QDRANT_PORT)
@@ -15,11 +18,19 @@ class Retriever:
             qdrant_client=self.client,
             collection_name=collection_name,
             query=query_embedding,
-            k=k
+            k=k,
+            payload_fields=PAYLOAD_FIELDS
         )
         #print(result)
         retrieved_chunks = [point.payload['text'] for point in result.points]
-        retrieved_sources = [point.payload['source'] for point in result.points]
+        retrieved_sources = [
+            {
+                'url': point.payload.get('url', ''),
+                'title': point.payload.get('title', ''),
+                'section': point.payload.get('section', ''),
+            }
+            for point in result.points
+        ]
         return retrieved_chunks, retrieved_sources
 
 
@@ -0,0 +1,136 @@
+import html
+import os
+import re
+
+# Longest section heading stored in a chunk payload
+MAX_SECTION_LENGTH = 120
+
+_TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+_MD_SPECIAL_RE = re.compile(r"([\\`*_\[\]#|~])")
+
+
+def source_name(src):
+    """Return the file stem of a (possibly Windows-style) markdown source path."""
+    base, _ext = os.path.splitext(os.path.basename(src))
+    return base.split("\\")[-1]
+
+
+def merge_elements(elements):
+    """Join loader elements the way the single-mode loader does.
+
+    Takes the documents produced by UnstructuredMarkdownLoader(mode="elements")
+    for one file and returns the joined text together with (offset, text)
+    pairs for every element the loader classified as a 'Title', so headings
+    come from the loader itself rather than from a search over the text.
+    """
+    parts = []
+    headings = []
+    offset = 0
+    for element in elements:
+        text = element.page_content
+        if element.metadata.get('category') == 'Title' and text.strip():
+            headings.append((offset, text.strip()))
+        parts.append(text)
+        offset += len(text) + len("\n\n")
+    return "\n\n".join(parts), headings
+
+
+def read_html_title(html_path):
+    """Return the <title> text of an HTML file, or "" if it has none."""
+    try:
+        with open(html_path, encoding="utf-8", errors="ignore") as f:
+            match = _TITLE_RE.search(f.read())
+    except OSError:
+        return ""
+    if not match:
+        return ""
+    return " ".join(html.unescape(match.group(1)).split())
+
+
+def build_source_manifest(documents, source_folder):
+    """Resolve the HTML url, title and headings of every source document once.
+
+    Returns a dict mapping the markdown source path to a dict with 'source',
+    'url', 'title' and 'headings' (the (offset, text) pairs that
+    load_markdown_documents stores in the document metadata). 'url' is empty
+    when no HTML page with the same (case-insensitive) name exists in
+    source_folder. Raises OSError if source_folder cannot be
+    listed, so a missing folder is not silently baked into the index.
+    """
+    html_files = {name.lower(): name for name in os.listdir(source_folder)}
+    manifest = {}
+    unresolved = []
+    for doc in documents:
+        src = doc.metadata.get('source', '')
+        if not src or src in manifest:
+            continue
+        name = source_name(src)
+        headings = doc.metadata.get('headings', [])
+        html_name = html_files.get((name + ".html").lower())
+        if html_name:
+            url = os.path.join(source_folder, html_name)
+            title = read_html_title(url)
+        else:
+            url = ""
+            title = ""
+            unresolved.append(name)
+        manifest[src] = {
+            'source': name,
+            'url': url,
+            'title': title or (headings[0][1] if headings else name),
+            'headings': headings,
+        }
+    if unresolved:
+        print(f"Warning: {len(unresolved)} of {len(manifest)} sources have no HTML page in {source_folder}")
+    return manifest
+
+
+def section_for(entry, start_index):
+    """Return the nearest heading at or before start_index, capped in length."""
+    if entry is None or start_index is None:
+        return ""
+    section = ""
+    for offset, heading in entry['headings']:
+        if offset > start_index:
+            break
+        section = heading
+    if len(section) > MAX_SECTION_LENGTH:
+        section = section[:MAX_SECTION_LENGTH - 1].rstrip() + "…"
+    return section
+
+
+def chunk_payload(chunk, metadata, manifest):
+    """Build the Qdrant payload stored for one chunk."""
+    entry = manifest.get(metadata.get('source', ''))
+    return {
+        'text': chunk,
+        'source': entry['source'] if entry else '',
+        'url': entry['url'] if entry else '',
+        'title': entry['title'] if entry else '',
+        'section': section_for(entry, metadata.get('start_index')),
+    }
+
+
+def _escape(text):
+    # Document text goes into HTML and Markdown; neutralise both
+    return _MD_SPECIAL_RE.sub(r"\\\1", html.escape(text))
+
+
+def format_source_header(src):
+    """Render the header line shown above a retrieved chunk."""
+    url = src.get('url', '')
+    if url:
+        link_text = _escape(src.get('title') or url)
+        header = f'**Source: <a href="{html.escape(url)}" target="_blank" rel="noopener noreferrer">{link_text}</a>**'
+    else:
+        header = "**Source: (unknown)**"
+    if src.get('section'):
+        header += f"\n\nSection: {_escape(src['section'])}"
+    return header
+
+
+def render_context_view(retrieved_chunks, retrieved_sources):
+    """Render each retrieved chunk below its source header in Markdown."""
+    blocks = [f"{format_source_header(src)}\n\n{text}"
+              for text, src in zip(retrieved_chunks, retrieved_sources)]
+    return "\n\n---\n\n".join(blocks) if blocks else "(no context retrieved)"
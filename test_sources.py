@@ -0,0 +1,153 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+import sources
+
+
+def _doc(source, text):
+    return SimpleNamespace(page_content=text, metadata={'source': source})
+
+
+@pytest.fixture
+def source_folder(tmp_path):
+    pages = tmp_path / "pages"
+    pages.mkdir()
+    (pages / "install.html").write_text(
+        "<html><head><title>Installing &amp; Setup</title></head></html>", encoding="utf-8")
+    (pages / "Config.html").write_text("<html><head></head></html>", encoding="utf-8")
+    return pages
+
+
+def _elements(*pairs):
+    return [SimpleNamespace(page_content=text, metadata={'category': category}) for category, text in pairs]
+
+
+def _loaded_doc(source, *pairs):
+    # What load_markdown_documents builds from the loader's elements
+    text, headings = sources.merge_elements(_elements(*pairs))
+    return SimpleNamespace(page_content=text, metadata={'source': source, 'headings': headings})
+
+
+@pytest.fixture
+def install_doc():
+    # crawl4ai pages start with an "On this page" link list repeating the
+    # headings, and body text may reuse heading words
+    return _loaded_doc(
+        "md/install.md",
+        ('NarrativeText', "Skip to content"),
+        ('ListItem', "Requirements"),
+        ('ListItem', "Steps"),
+        ('ListItem', "Set up my_plugin"),
+        ('Title', "Install guide"),
+        ('NarrativeText', "Check the Requirements before the Steps below."),
+        ('Title', "Requirements"),
+        ('NarrativeText', "A supported OS."),
+        ('Title', "Steps"),
+        ('NarrativeText', "Run the installer."),
+        ('Title', "Set up my_plugin"),
+        ('NarrativeText', "Configure it."),
+        ('Title', "Fish & Chips"),
+        ('NarrativeText', "Serve hot."),
+    )
+
+
+def _section(doc, manifest, chunk):
+    metadata = {'source': doc.metadata['source'], 'start_index': doc.page_content.index(chunk)}
+    return sources.chunk_payload(chunk, metadata, manifest)['section']
+
+
+def test_manifest_matching_html_uses_html_title(source_folder, install_doc):
+    manifest = sources.build_source_manifest([install_doc], str(source_folder))
+
+    entry = manifest["md/install.md"]
+    assert entry['source'] == "install"
+    assert entry['url'] == os.path.join(str(source_folder), "install.html")
+    assert entry['title'] == "Installing & Setup"
+
+    payload = sources.chunk_payload(
+        "Run the installer.",
+        {'source': "md/install.md", 'start_index': install_doc.page_content.index("Run")},
+        manifest)
+    assert payload == {
+        'text': "Run the installer.",
+        'source': "install",
+        'url': entry['url'],
+        'title': "Installing & Setup",
+        'section': "Steps",
+    }
+
+
+def test_sections_ignore_link_lists_and_body_mentions(source_folder, install_doc):
+    manifest = sources.build_source_manifest([install_doc], str(source_folder))
+
+    assert _section(install_doc, manifest, "Skip to content") == ""
+    assert _section(install_doc, manifest, "Check the Requirements") == "Install guide"
+    assert _section(install_doc, manifest, "A supported OS.") == "Requirements"
+    assert _section(install_doc, manifest, "Run the installer.") == "Steps"
+    assert _section(install_doc, manifest, "Configure it.") == "Set up my_plugin"
+    assert _section(install_doc, manifest, "Serve hot.") == "Fish & Chips"
+
+
+def test_merge_elements_matches_single_mode_text():
+    text, headings = sources.merge_elements(_elements(
+        ('Title', "Use `my_plugin`"), ('NarrativeText', "Body"), ('Title', "Next")))
+
+    assert text == "Use `my_plugin`\n\nBody\n\nNext"
+    assert headings == [(0, "Use `my_plugin`"), (text.index("Next"), "Next")]
+
+
+def test_title_falls_back_to_first_heading(source_folder):
+    doc = _loaded_doc("md/other.md", ('ListItem', "Menu"), ('Title', "Other page"))
+    manifest = sources.build_source_manifest([doc], str(source_folder))
+
+    assert manifest["md/other.md"]['title'] == "Other page"
+
+
+def test_manifest_case_mismatch_keeps_real_filename(source_folder):
+    manifest = sources.build_source_manifest([_doc("md/config.md", "Options")], str(source_folder))
+
+    entry = manifest["md/config.md"]
+    assert entry['url'] == os.path.join(str(source_folder), "Config.html")
+    # No <title> and no markdown headings: fall back to the file stem
+    assert entry['title'] == "config"
+
+
+def test_manifest_missing_html_and_windows_path(source_folder, capsys):
+    src = "markdown_files_crawler\\missing.md"
+    manifest = sources.build_source_manifest([_doc(src, "Body")], str(source_folder))
+
+    entry = manifest[src]
+    assert entry['source'] == "missing"
+    assert entry['url'] == ""
+    assert "1 of 1 sources" in capsys.readouterr().out
+    assert sources.chunk_payload("Body", {'source': src, 'start_index': 0}, manifest)['section'] == ""
+
+
+def test_manifest_missing_folder_raises(tmp_path):
+    with pytest.raises(OSError):
+        sources.build_source_manifest([_doc("a.md", "A")], str(tmp_path / "nope"))
+
+
+def test_section_is_capped():
+    entry = {'headings': [(0, "x" * 500)]}
+    assert len(sources.section_for(entry, 10)) == sources.MAX_SECTION_LENGTH
+
+
+def test_render_context_view_escapes_document_text():
+    view = sources.render_context_view(
+        ["chunk one", "chunk two"],
+        [
+            {'url': "C:\\pages\\a.html", 'title': "<b>A & *B*</b>", 'section': "use_the `cli`"},
+            {'url': "", 'title': "", 'section': ""},
+        ])
+
+    assert view == (
+        '**Source: <a href="C:\\pages\\a.html" target="_blank" rel="noopener noreferrer">'
+        '&lt;b&gt;A &amp; \\*B\\*&lt;/b&gt;</a>**\n\n'
+        'Section: use\\_the \\`cli\\`\n\nchunk one'
+        '\n\n---\n\n'
+        '**Source: (unknown)**\n\nchunk two'
+    )
+    assert sources.render_context_view([], []) == "(no context retrieved)"